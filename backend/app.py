@@ -1,16 +1,25 @@
+from contextlib import asynccontextmanager
 from typing import List
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
 
-from backend.models import Mode
-from backend.services import SimulationManager, SimulationSettings
+from backend.models import GPU_AVAILABLE, Mode
+from backend.services import SimulationManager, SimulationSettings, check_threading_layer
 
 
 from fastapi.staticfiles import StaticFiles
 
-app = FastAPI(title="Swarm Simulation Service")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_threading_layer()
+    yield
+
+
+app = FastAPI(title="Swarm Simulation Service", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +39,7 @@ class SimulationCreateRequest(BaseModel):
     mode: str = Field(default=Mode.SWARM.value)
     timestep: float = Field(default=0.1, gt=0.0)
     update_interval: float = Field(default=0.1, gt=0.0)
+    use_gpu: bool = Field(default=False)
 
     @validator("mode")
     def validate_mode(cls, value: str) -> str:
@@ -61,11 +71,14 @@ class SimulationSnapshot(BaseModel):
 @app.post("/api/simulations", response_model=SimulationCreateResponse)
 async def create_simulation(payload: SimulationCreateRequest) -> SimulationCreateResponse:
     mode = MODE_LOOKUP[payload.mode]
+    if payload.use_gpu and not GPU_AVAILABLE:
+        raise HTTPException(status_code=400, detail="GPU backend is not available")
     settings = SimulationSettings(
         num_agents=payload.num_agents,
         mode=mode,
         timestep=payload.timestep,
         update_interval=payload.update_interval,
+        use_gpu=payload.use_gpu,
     )
     instance = await simulation_manager.create(settings)
     return SimulationCreateResponse(
@@ -106,26 +119,31 @@ async def delete_simulation(simulation_id: str) -> dict:
     return {"status": "deleted", "simulation_id": simulation_id}
 
 
+async def send_frame(websocket: WebSocket, payload: dict) -> None:
+    """Send ``payload`` as an orjson-encoded binary frame."""
+    await websocket.send_bytes(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
 @app.websocket("/ws/simulations/{simulation_id}")
 async def simulation_stream(websocket: WebSocket, simulation_id: str) -> None:
     instance = await simulation_manager.get(simulation_id)
     await websocket.accept()
     if instance is None:
-        await websocket.send_json({"type": "error", "message": "Simulation not found"})
+        await send_frame(websocket, {"type": "error", "message": "Simulation not found"})
         await websocket.close(code=1008)
         return
 
     queue = await instance.register()
     try:
         snapshot = await instance.snapshot()
-        await websocket.send_json({"type": "snapshot", **snapshot})
+        await send_frame(websocket, {"type": "snapshot", **snapshot})
         while True:
             payload = await queue.get()
-            if payload.get("type") == "shutdown":
-                await websocket.send_json({"type": "shutdown"})
+            if payload.get("type") in ("shutdown", "error"):
+                await send_frame(websocket, payload)
                 break
             try:
-                await websocket.send_json({"type": "tick", **payload})
+                await send_frame(websocket, {"type": "tick", **payload})
             except WebSocketDisconnect:
                 break
     except WebSocketDisconnect:
@@ -6,6 +6,7 @@ from .swarm import (
     HPPModel,
     DPPModel,
 )
+from .gpu import GPU_AVAILABLE, GPUSwarmBackend
 
 __all__ = [
     "Mode",
@@ -14,4 +15,6 @@ __all__ = [
     "TorusModel",
     "HPPModel",
     "DPPModel",
+    "GPU_AVAILABLE",
+    "GPUSwarmBackend",
 ]
@@ -0,0 +1,111 @@
+"""Optional CUDA backend for the zone model.
+
+Needs ``cupy`` and a CUDA-capable device, neither of which is listed in
+requirements.txt. ``GPU_AVAILABLE`` reports whether both are present.
+"""
+import numpy as np
+from numba import cuda
+
+from backend.models import zones
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+GPU_AVAILABLE = cp is not None and cuda.is_available()
+
+THREADS_PER_BLOCK = 128
+
+_empty_zone_state = cuda.jit(device=True)(zones.empty_zone_state)
+_accumulate_neighbour = cuda.jit(device=True)(zones.accumulate_neighbour)
+_resolve_direction = cuda.jit(device=True)(zones.resolve_direction)
+
+
+@cuda.jit
+def step_kernel(pos, vel, speeds, zor, zoo, zoa, dt, new_pos, new_vel):
+    """Advance agent ``i`` by one timestep; one thread per agent."""
+    i = cuda.grid(1)
+    n = pos.shape[0]
+    if i >= n:
+        return
+
+    zor2 = zor * zor
+    zoo2 = zoo * zoo
+    zoa2 = zoa * zoa
+    state = _empty_zone_state()
+    for j in range(n):
+        if i == j:
+            continue
+        state = _accumulate_neighbour(
+            state,
+            pos[j, 0] - pos[i, 0],
+            pos[j, 1] - pos[i, 1],
+            pos[j, 2] - pos[i, 2],
+            vel[j, 0],
+            vel[j, 1],
+            vel[j, 2],
+            zor2,
+            zoo2,
+            zoa,
+            zoa2,
+        )
+    ax, ay, az = _resolve_direction(state, vel[i, 0], vel[i, 1], vel[i, 2])
+
+    step_length = speeds[i] * dt
+    new_vel[i, 0] = ax
+    new_vel[i, 1] = ay
+    new_vel[i, 2] = az
+    new_pos[i, 0] = pos[i, 0] + ax * step_length
+    new_pos[i, 1] = pos[i, 1] + ay * step_length
+    new_pos[i, 2] = pos[i, 2] + az * step_length
+
+
+class GPUSwarmBackend:
+    def __init__(self, model):
+        """
+        Run a swarm model's step on the GPU with its state resident on the device.
+
+        Only the shared zone-model update is run on the device; per-mode
+        overrides of update_agent_position are not applied.
+
+        :param model: BaseSwarmModel whose arrays seed the device state
+        """
+        if not GPU_AVAILABLE:
+            raise RuntimeError("GPU backend requires cupy and a CUDA device")
+        self.model = model
+        self.positions = cp.asarray(model.positions)
+        self.velocities = cp.asarray(model.velocities)
+        self.speeds = cp.asarray(model.speeds)
+        self._next_positions = cp.empty_like(self.positions)
+        self._next_velocities = cp.empty_like(self.velocities)
+        self._blocks = (model.num_agents + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+
+    def step(self, timestep=0.1):
+        """Advance the simulation on the device and return agent states."""
+        step_kernel[self._blocks, THREADS_PER_BLOCK](
+            self.positions,
+            self.velocities,
+            self.speeds,
+            np.float32(self.model.zor),
+            np.float32(self.model.zoo),
+            np.float32(self.model.zoa),
+            np.float32(timestep),
+            self._next_positions,
+            self._next_velocities,
+        )
+        self.positions, self._next_positions = self._next_positions, self.positions
+        self.velocities, self._next_velocities = self._next_velocities, self.velocities
+        self.sync()
+        return self.model.packed_states()
+
+    def sync(self):
+        """Copy the device state back into the host model's arrays."""
+        self.model.positions[...] = self.positions.get()
+        self.model.velocities[...] = self.velocities.get()
+
+    def agent_states(self):
+        return self.model.agent_states()
+
+    def packed_states(self):
+        return self.model.packed_states()
@@ -0,0 +1,59 @@
+import numpy as np
+from numba import njit
+
+MORTON_BITS = 10
+
+
+def _part1by2(x):
+    """Spread the low 10 bits of ``x`` so that two zero bits follow each one."""
+    x = x & 0x3FF
+    x = (x | (x << 16)) & 0x030000FF
+    x = (x | (x << 8)) & 0x0300F00F
+    x = (x | (x << 4)) & 0x030C30C3
+    x = (x | (x << 2)) & 0x09249249
+    return x
+
+
+def morton_encode_3d(cells):
+    """Interleave (N, 3) non-negative integer cell coordinates into Z-order codes."""
+    cells = cells.astype(np.uint32)
+    return _part1by2(cells[:, 0]) | (_part1by2(cells[:, 1]) << 1) | (_part1by2(cells[:, 2]) << 2)
+
+
+def morton_order(positions, cell_size):
+    """Return the permutation that sorts ``positions`` along a Z-curve of ``cell_size`` cells."""
+    cells = np.floor((positions - positions.min(axis=0)) / cell_size)
+    codes = morton_encode_3d(np.minimum(cells, (1 << MORTON_BITS) - 1))
+    return np.argsort(codes, kind="stable")
+
+
+@njit(cache=True)
+def cell_hash(cx, cy, cz, table_size):
+    """Hash integer cell coordinates into a bucket of a ``table_size`` table."""
+    return ((cx * 73856093) ^ (cy * 19349663) ^ (cz * 83492791)) % table_size
+
+
+def build_cell_list(positions, cell_size, table_size=None):
+    """
+    Bucket agents into a hashed uniform grid.
+
+    Cells are offset by one so that every neighbouring cell has non-negative
+    coordinates. Different cells may share a bucket, so callers must compare
+    ``cells`` before treating a bucket entry as a neighbour.
+
+    :param positions: (N, 3) agent positions
+    :param cell_size: edge length of a grid cell
+    :param table_size: number of hash buckets, ``2 * N`` by default
+    :return: ``(cells, cell_start, cell_end, sorted_idx)`` where bucket ``h``
+        holds agents ``sorted_idx[cell_start[h]:cell_end[h]]``
+    """
+    cells = (np.floor((positions - positions.min(axis=0)) / cell_size) + 1).astype(np.int64)
+    if table_size is None:
+        table_size = max(2 * len(positions), 1)
+    keys = cell_hash(cells[:, 0], cells[:, 1], cells[:, 2], table_size)
+    sorted_idx = np.argsort(keys, kind="stable")
+    sorted_keys = keys[sorted_idx]
+    buckets = np.arange(table_size)
+    cell_start = np.searchsorted(sorted_keys, buckets, side="left")
+    cell_end = np.searchsorted(sorted_keys, buckets, side="right")
+    return cells, cell_start, cell_end, sorted_idx
@@ -1,7 +1,15 @@
 import enum
+import functools
+
 import numpy as np
+from numba import njit, prange
+
+from backend.models import zones
+from backend.models.spatial import build_cell_list, cell_hash, morton_order
 
-from backend.models.fish_agent import agent, euclidean_distance, angle_between
+_empty_zone_state = njit(cache=True)(zones.empty_zone_state)
+_accumulate_neighbour = njit(cache=True, fastmath=True)(zones.accumulate_neighbour)
+_resolve_direction = njit(cache=True, fastmath=True)(zones.resolve_direction)
 
 
 class Mode(enum.Enum):
@@ -11,10 +19,64 @@ class Mode(enum.Enum):
     DPP = "dpp"
 
 
-def unit_vector(vector):
-    """Normalize a vector to unit length."""
-    magnitude = np.linalg.norm(vector)
-    return vector / magnitude if magnitude != 0 else vector
+@functools.lru_cache(maxsize=None)
+def _make_step_kernel(zor, zoo, zoa):
+    """
+    Compile the zone-model direction kernel for one set of zone radii.
+
+    The radii are captured as compile-time constants, so each mode gets its own
+    specialised kernel; results are cached per ``(zor, zoo, zoa)``.
+    """
+    zoa = np.float32(zoa)
+    zor2 = np.float32(zor) ** 2
+    zoo2 = np.float32(zoo) ** 2
+    zoa2 = zoa ** 2
+
+    @njit(cache=True, parallel=True, fastmath=True, nogil=True)
+    def aggregate_directions(positions, velocities, cells, cell_start, cell_end, sorted_idx, out_dir):
+        """
+        Write the normalized zone-model heading of every agent into ``out_dir``.
+
+        Only agents in the 27 grid cells around agent ``i`` are visited, so the
+        grid from build_cell_list must use a cell size of at least ``zoa``.
+        """
+        n = positions.shape[0]
+        table_size = cell_start.shape[0]
+        for i in prange(n):
+            state = _empty_zone_state()
+            cx = cells[i, 0]
+            cy = cells[i, 1]
+            cz = cells[i, 2]
+            for gx in range(cx - 1, cx + 2):
+                for gy in range(cy - 1, cy + 2):
+                    for gz in range(cz - 1, cz + 2):
+                        h = cell_hash(gx, gy, gz, table_size)
+                        for s in range(cell_start[h], cell_end[h]):
+                            j = sorted_idx[s]
+                            if j == i:
+                                continue
+                            # Buckets are shared between colliding cells.
+                            if cells[j, 0] != gx or cells[j, 1] != gy or cells[j, 2] != gz:
+                                continue
+                            state = _accumulate_neighbour(
+                                state,
+                                positions[j, 0] - positions[i, 0],
+                                positions[j, 1] - positions[i, 1],
+                                positions[j, 2] - positions[i, 2],
+                                velocities[j, 0],
+                                velocities[j, 1],
+                                velocities[j, 2],
+                                zor2,
+                                zoo2,
+                                zoa,
+                                zoa2,
+                            )
+
+            out_dir[i, 0], out_dir[i, 1], out_dir[i, 2] = _resolve_direction(
+                state, velocities[i, 0], velocities[i, 1], velocities[i, 2]
+            )
+
+    return aggregate_directions
 
 
 class BaseSwarmModel:
@@ -28,9 +90,6 @@ class BaseSwarmModel:
         self.num_agents = num_agents
         self.mode = mode if mode is not None else Mode.SWARM
 
-        self.agent_distance_vector_table = np.full((num_agents, num_agents, 3), np.inf)
-        self.agent_distance_magnitude_table = np.full((num_agents, num_agents), np.inf)
-
         self.agent_new_direction = np.zeros((num_agents, 3), dtype=np.float32)
 
         self.zor = 0.5
@@ -52,102 +111,74 @@ class BaseSwarmModel:
         # zdata = R * np.sin(theta)
 
 
-        self.agents = [
-            agent(
-                i,
-                (xdata[i], ydata[i], zdata[i]),
-                speed=None,
-                velocity_unit_vector=None,
-                theta=None,
-                turning_angle=None,
-            )
-            for i in range(num_agents)
-        ]
-
-    def update_agent_distance_table(self):
-        """Update distance table between agents."""
-        for k in range(self.num_agents):
-            self.agent_new_direction[k] = 0
-        for i in range(self.num_agents):
-            for j in range(self.num_agents):
-                if self.agents[i].id == self.agents[j].id or self.agent_distance_magnitude_table[i][j] != np.inf:
-                    continue
-
-                r1 = np.array(self.agents[i].pos)
-                r2 = np.array(self.agents[j].pos)
-
-                self.agent_distance_vector_table[i][j] = unit_vector(r2 - r1)
-                self.agent_distance_vector_table[j][i] = unit_vector(r1 - r2)
+        self.positions = np.stack([xdata, ydata, zdata], axis=1).astype(np.float32)
 
-                distance = euclidean_distance(r1, r2)
-                self.agent_distance_magnitude_table[i][j] = distance
-                self.agent_distance_magnitude_table[j][i] = distance
+        # Initial headings follow the legacy fish_agent.agent: fixed x component, noisy y/z.
+        noise = 0.1 * np.random.randn(num_agents, 2)
+        velocities = np.column_stack(
+            [np.full(num_agents, 0.1), np.sin(0.1) + noise[:, 0], np.cos(0.1) + noise[:, 1]]
+        )
+        velocities /= np.linalg.norm(velocities, axis=1, keepdims=True)
+        self.velocities = velocities.astype(np.float32)
+        self.speeds = np.ones(num_agents, dtype=np.float32)
+        # Storage is kept in Morton order; ids map each row back to its agent.
+        self.ids = np.arange(num_agents)
 
     def update_agent_position(self):
         """Update agent positions based on swarm behavior."""
         raise NotImplementedError("Subclasses must implement update_agent_position method")
 
     def _common_update_logic(self):
-        self.update_agent_distance_table()
-        for i in range(self.num_agents):
-            my_distance = self.agent_distance_magnitude_table[i]
-            repulsion_mode = 0 if (my_distance[my_distance <= self.zor].size == 0) else 1
-            flag_o = 0
-            flag_a = 0
-            self.agent_new_direction[i] = 0
-            for j in range(self.num_agents):
-                distance = self.agent_distance_magnitude_table[i][j]
-                if self.agents[i].id == self.agents[j].id:
-                    continue
-                if repulsion_mode and distance > self.zor:
-                    continue
-                elif repulsion_mode and distance <= self.zor:
-                    self.agent_new_direction[i] -= self.agent_distance_vector_table[i][j]
-                elif distance > self.zor and distance <= self.zoo:
-                    vj = np.array(self.agents[j].velocity_unit_vector)
-                    vj /= 2
-                    self.agent_new_direction[i] += vj
-                    flag_o = 1
-                elif distance > self.zoo and distance <= self.zoa:
-                    self.agent_new_direction[i] += self.agent_distance_vector_table[i][j] / 2
-                    flag_a = 1
-
-            if (not repulsion_mode) and not (flag_o == 1 and flag_a == 1):
-                self.agent_new_direction[i] *= 2
-
-            if np.any(self.agent_new_direction[i]):
-                self.agent_new_direction[i] = unit_vector(self.agent_new_direction[i])
-            else:
-                v = np.array(self.agents[i].velocity_unit_vector)
-                self.agent_new_direction[i] = v
-
-        self.agent_distance_vector_table = np.full((self.num_agents, self.num_agents, 3), np.inf)
-        self.agent_distance_magnitude_table = np.full((self.num_agents, self.num_agents), np.inf)
+        cells, cell_start, cell_end, sorted_idx = build_cell_list(self.positions, self.zoa)
+        # Kernels are cached per radii, so this only compiles on a mode's first step.
+        step_fn = _make_step_kernel(self.zor, self.zoo, self.zoa)
+        step_fn(
+            self.positions,
+            self.velocities,
+            cells,
+            cell_start,
+            cell_end,
+            sorted_idx,
+            self.agent_new_direction,
+        )
 
     def step(self, timestep=0.1):
         """Advance the simulation by one timestep and return agent states."""
         self.update_agent_position()
-        updates = []
-        for i in range(self.num_agents):
-            agent_ref = self.agents[i]
-            new_direction = self.agent_new_direction[i]
-            if not np.any(new_direction):
-                new_direction = np.array(agent_ref.velocity_unit_vector, dtype=np.float32)
-            else:
-                new_direction = unit_vector(new_direction)
-            agent_ref.velocity_unit_vector = tuple(new_direction.tolist())
-            displacement = new_direction * agent_ref.speed * timestep
-            new_position = np.array(agent_ref.pos, dtype=np.float32) + displacement
-            agent_ref.pos = tuple(new_position.tolist())
-            updates.append(
-                {
-                    "id": agent_ref.id,
-                    "position": agent_ref.pos,
-                    "velocity": agent_ref.velocity_unit_vector,
-                }
+        directions = self.agent_new_direction
+        magnitudes = np.linalg.norm(directions, axis=1)
+        moving = magnitudes != 0
+        self.velocities[moving] = directions[moving] * (1 / magnitudes[moving])[:, None]
+        self.positions += self.velocities * (self.speeds * timestep)[:, None]
+        self._sort_agents()
+        self.agent_new_direction.fill(0.0)
+        return self.packed_states()
+
+    def _sort_agents(self):
+        """Reorder agent storage so spatial neighbours sit next to each other in memory."""
+        order = morton_order(self.positions, self.zoa)
+        self.ids[...] = self.ids[order]
+        self.positions[...] = self.positions[order]
+        self.velocities[...] = self.velocities[order]
+        self.speeds[...] = self.speeds[order]
+
+    def agent_states(self):
+        """Return the position and velocity of every agent, ordered by id, as plain Python data."""
+        order = np.argsort(self.ids)
+        return [
+            {"id": i, "position": p, "velocity": v}
+            for i, p, v in zip(
+                self.ids[order].tolist(), self.positions[order].tolist(), self.velocities[order].tolist()
             )
-        self.agent_new_direction = np.zeros((self.num_agents, 3), dtype=np.float32)
-        return updates
+        ]
+
+    def packed_states(self):
+        """Return agent ids, positions and velocities as parallel lists."""
+        return {
+            "ids": self.ids.tolist(),
+            "positions": self.positions.tolist(),
+            "velocities": self.velocities.tolist(),
+        }
 
 
 class SwarmModel(BaseSwarmModel):
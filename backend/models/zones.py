@@ -0,0 +1,83 @@
+"""Zone-model rules shared by the CPU and CUDA kernels.
+
+These are plain scalar functions so that swarm.py can compile them with
+``njit`` and gpu.py with ``cuda.jit(device=True)``. A zone state is the tuple
+``(rx, ry, rz, ox, oy, oz, has_repulsion, flag_o, flag_a)``: repulsion and
+orientation/attraction sums accumulated side by side from zone masks, plus
+which zones have been seen.
+"""
+import math
+
+from numba import float32
+
+
+def empty_zone_state():
+    """Return the zone state of an agent with no neighbours yet."""
+    zero = float32(0.0)
+    return zero, zero, zero, zero, zero, zero, False, False, False
+
+
+def accumulate_neighbour(state, dx, dy, dz, vx, vy, vz, zor2, zoo2, zoa, zoa2):
+    """
+    Fold one neighbour into ``state``.
+
+    :param state: zone state so far
+    :param dx, dy, dz: offset from the agent to the neighbour
+    :param vx, vy, vz: heading of the neighbour
+    :param zor2, zoo2: squared repulsion and orientation radii
+    :param zoa, zoa2: attraction radius and its square
+    :return: the updated zone state
+    """
+    rx, ry, rz, ox, oy, oz, has_repulsion, flag_o, flag_a = state
+    # Reject pairs outside zoa on a single axis before the full distance.
+    if abs(dx) > zoa or abs(dy) > zoa or abs(dz) > zoa:
+        return state
+    # Zones are tested on squared distances so sqrt is only taken for neighbours.
+    d2 = dx * dx + dy * dy + dz * dz
+    if d2 > zoa2:
+        return state
+    # Co-located agents contribute no direction.
+    inv_distance = float32(1.0) / float32(math.sqrt(d2)) if d2 > 0 else float32(0.0)
+    ux = dx * inv_distance
+    uy = dy * inv_distance
+    uz = dz * inv_distance
+
+    m_r = d2 <= zor2
+    m_o = (d2 > zor2) & (d2 <= zoo2)
+    m_a = d2 > zoo2
+    half = float32(0.5)
+    return (
+        rx - m_r * ux,
+        ry - m_r * uy,
+        rz - m_r * uz,
+        ox + half * (m_o * vx + m_a * ux),
+        oy + half * (m_o * vy + m_a * uy),
+        oz + half * (m_o * vz + m_a * uz),
+        has_repulsion | m_r,
+        flag_o | m_o,
+        flag_a | m_a,
+    )
+
+
+def resolve_direction(state, vx, vy, vz):
+    """
+    Apply the repulsion gate to ``state`` and return the normalized heading.
+
+    Falls back to the agent's own heading ``(vx, vy, vz)`` when no direction results.
+    """
+    rx, ry, rz, ox, oy, oz, has_repulsion, flag_o, flag_a = state
+    if has_repulsion:
+        ax = rx
+        ay = ry
+        az = rz
+    else:
+        scale = float32(1.0) if (flag_o and flag_a) else float32(2.0)
+        ax = ox * scale
+        ay = oy * scale
+        az = oz * scale
+
+    magnitude = float32(math.sqrt(ax * ax + ay * ay + az * az))
+    if magnitude != 0:
+        inv_magnitude = float32(1.0) / magnitude
+        return ax * inv_magnitude, ay * inv_magnitude, az * inv_magnitude
+    return vx, vy, vz
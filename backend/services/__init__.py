@@ -1,3 +1,3 @@
-from .simulation_manager import SimulationManager, SimulationSettings
+from .simulation_manager import SimulationManager, SimulationSettings, check_threading_layer
 
-__all__ = ["SimulationManager", "SimulationSettings"]
+__all__ = ["SimulationManager", "SimulationSettings", "check_threading_layer"]
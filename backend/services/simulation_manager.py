@@ -1,9 +1,16 @@
 import asyncio
+import logging
+import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Set
 
-from backend.models import Mode, SwarmModel, TorusModel, HPPModel, DPPModel
+import numba
+
+from backend.models import Mode, SwarmModel, TorusModel, HPPModel, DPPModel, GPUSwarmBackend
+
+logger = logging.getLogger(__name__)
 
 MODE_CLASS_MAP = {
     Mode.SWARM: SwarmModel,
@@ -12,6 +19,46 @@ MODE_CLASS_MAP = {
     Mode.DPP: DPPModel,
 }
 
+# Simulations step concurrently from STEP_EXECUTOR, which the workqueue
+# threading layer does not support, and TBB first started from a worker
+# thread hangs at interpreter exit. Only OpenMP is accepted.
+numba.config.THREADING_LAYER = "omp"
+
+# Model steps are CPU-bound and release the GIL in their kernels, so they run
+# here instead of on the event loop. Each worker launches its own parallel
+# kernels, so the Numba threads are split between workers rather than every
+# worker claiming all of them.
+STEP_WORKERS = min(4, os.cpu_count() or 1)
+STEP_EXECUTOR = ThreadPoolExecutor(
+    max_workers=STEP_WORKERS,
+    initializer=numba.set_num_threads,
+    initargs=(max(1, numba.config.NUMBA_NUM_THREADS // STEP_WORKERS),),
+)
+
+
+
+def check_threading_layer() -> None:
+    """Load the Numba threading layer now, so a host without OpenMP fails at startup."""
+    try:
+        numba.get_num_threads()
+    except ValueError as exc:
+        raise RuntimeError(
+            "Numba could not load its OpenMP threading layer; install libgomp (Linux) or libomp (macOS)"
+        ) from exc
+
+
+# Ticks buffered per websocket subscriber before the oldest are dropped.
+SUBSCRIBER_QUEUE_SIZE = 8
+
+
+def _offer(queue: asyncio.Queue, payload: Dict[str, Any]) -> None:
+    """Enqueue without waiting, dropping the oldest entry when the queue is full."""
+    try:
+        queue.put_nowait(payload)
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(payload)
+
 
 @dataclass
 class SimulationSettings:
@@ -19,6 +66,7 @@ class SimulationSettings:
     mode: Mode = Mode.SWARM
     timestep: float = 0.1
     update_interval: float = 0.1
+    use_gpu: bool = False
 
 
 class SimulationInstance:
@@ -27,6 +75,8 @@ class SimulationInstance:
         self.settings = settings
         model_cls = MODE_CLASS_MAP[settings.mode]
         self.model = model_cls(settings.num_agents)
+        if settings.use_gpu:
+            self.model = GPUSwarmBackend(self.model)
         self.timestep = settings.timestep
         self.update_interval = settings.update_interval
         self.tick: int = 0
@@ -37,14 +87,7 @@ class SimulationInstance:
 
     async def snapshot(self) -> Dict[str, Any]:
         async with self._lock:
-            state = [
-                {
-                    "id": agent.id,
-                    "position": agent.pos,
-                    "velocity": agent.velocity_unit_vector,
-                }
-                for agent in self.model.agents
-            ]
+            state = self.model.agent_states()
             return {
                 "simulation_id": self.id,
                 "tick": self.tick,
@@ -53,12 +96,13 @@ class SimulationInstance:
                     "mode": self.settings.mode.value,
                     "timestep": self.timestep,
                     "update_interval": self.update_interval,
+                    "use_gpu": self.settings.use_gpu,
                 },
                 "agents": state,
             }
 
     async def register(self) -> asyncio.Queue:
-        queue: asyncio.Queue = asyncio.Queue()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
         self._subscribers.add(queue)
         if not self._running:
             await self._start()
@@ -67,10 +111,17 @@ class SimulationInstance:
     def unregister(self, queue: asyncio.Queue) -> None:
         self._subscribers.discard(queue)
         if not self._subscribers:
-            asyncio.create_task(self._stop())
+            asyncio.create_task(self._stop_if_idle())
+
+    async def _stop_if_idle(self) -> None:
+        # A subscriber may have registered again before this task got to run.
+        if not self._subscribers:
+            await self._stop()
 
     async def _start(self) -> None:
-        if self._runner_task and not self._runner_task.done():
+        # A runner that is still being stopped may hold the lock for the rest of
+        # its step; the new runner simply waits for it.
+        if self._running:
             return
         self._running = True
         self._runner_task = asyncio.create_task(self._run())
@@ -79,40 +130,55 @@ class SimulationInstance:
         if not self._running:
             return
         self._running = False
-        if self._runner_task:
-            self._runner_task.cancel()
+        task = self._runner_task
+        if task:
+            task.cancel()
             try:
-                await self._runner_task
+                await task
             except asyncio.CancelledError:
                 pass
-            self._runner_task = None
+            if self._runner_task is task:
+                self._runner_task = None
 
     async def _run(self) -> None:
         try:
             while self._running:
                 async with self._lock:
-                    agents_state: List[Dict[str, Any]] = self.model.step(self.timestep)
+                    loop = asyncio.get_running_loop()
+                    step = loop.run_in_executor(STEP_EXECUTOR, self.model.step, self.timestep)
+                    try:
+                        agents_state: Dict[str, List[Any]] = await asyncio.shield(step)
+                    except asyncio.CancelledError:
+                        # The worker cannot be interrupted, so keep the lock until
+                        # its step is done rather than letting another touch the model.
+                        await step
+                        raise
                     self.tick += 1
                     payload = {
                         "simulation_id": self.id,
                         "tick": self.tick,
-                        "agents": agents_state,
+                        **agents_state,
                     }
                 await self._broadcast(payload)
                 await asyncio.sleep(self.update_interval)
         except asyncio.CancelledError:
             pass
+        except Exception as exc:
+            # Without this the runner dies silently and subscribers wait forever.
+            logger.exception("Simulation %s step failed", self.id)
+            self._running = False
+            await self._broadcast({"type": "error", "message": f"Simulation step failed: {exc}"})
 
     async def _broadcast(self, payload: Dict[str, Any]) -> None:
         if not self._subscribers:
             return
         for subscriber in list(self._subscribers):
-            await subscriber.put(payload)
+            _offer(subscriber, payload)
 
     async def close(self) -> None:
         await self._stop()
         for queue in self._subscribers:
-            queue.put_nowait({"type": "shutdown"})
+            _offer(queue, {"type": "shutdown"})
         self._subscribers.clear()
 
 
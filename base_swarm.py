@@ -63,11 +63,7 @@ class BaseSwarmModel:
         for k in range(self.num_agents):
             self.agent_new_direction[k] = 0
         for i in range(self.num_agents):
-            for j in range(self.num_agents):
-                if self.agents[i].id == self.agents[j].id or \
-                   self.agent_distance_magnitude_table[i][j] != np.inf:
-                    continue
-                
+            for j in range(i + 1, self.num_agents):
                 r1 = np.array(self.agents[i].pos)
                 r2 = np.array(self.agents[j].pos)
                 
@@ -87,15 +83,16 @@ class BaseSwarmModel:
 
     def _common_update_logic(self):
         self.update_agent_distance_table()
+        # The diagonal is inf, so an agent never repels itself.
+        has_repulsion = (self.agent_distance_magnitude_table <= self.zor).any(axis=1)
         for i in range(self.num_agents):
-            my_distance = self.agent_distance_magnitude_table[i]
-            repulsion_mode = 0 if (my_distance[my_distance <= self.zor].size == 0) else 1
+            repulsion_mode = has_repulsion[i]
             flag_o = 0
             flag_a = 0
             self.agent_new_direction[i] = 0
             for j in range(self.num_agents):
                 distance = self.agent_distance_magnitude_table[i][j]
-                if self.agents[i].id == self.agents[j].id:
+                if i == j:
                     continue
                 if repulsion_mode and distance > self.zor:
                     continue
@@ -121,8 +118,6 @@ class BaseSwarmModel:
                 v = np.array(self.agents[i].velocity_unit_vector)
                 self.agent_new_direction[i] = v
 
-        self.agent_distance_vector_table = np.full((self.num_agents, self.num_agents, 3), np.inf)
-        self.agent_distance_magnitude_table = np.full((self.num_agents, self.num_agents), np.inf)
         pass
 
     def step(self, timestep=0.1):
@@ -2,6 +2,7 @@ import { defineStore } from 'pinia';
 
 const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:8000';
 const WS_BASE = import.meta.env.VITE_WS_BASE || 'ws://localhost:8000';
+const frameDecoder = new TextDecoder();
 
 export const useSimulationStore = defineStore('simulation', {
   state: () => ({
@@ -56,6 +57,8 @@ export const useSimulationStore = defineStore('simulation', {
       }
 
       const socket = new WebSocket(`${WS_BASE}/ws/simulations/${this.simulationId}`);
+      // Frames arrive as orjson-encoded binary messages.
+      socket.binaryType = 'arraybuffer';
       this.socket = socket;
 
       socket.onopen = () => {
@@ -76,13 +79,23 @@ export const useSimulationStore = defineStore('simulation', {
 
       socket.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data);
+          const text =
+            typeof event.data === 'string' ? event.data : frameDecoder.decode(event.data);
+          const data = JSON.parse(text);
           switch (data.type) {
             case 'snapshot':
-            case 'tick':
               this.tick = data.tick;
               this.agents = data.agents;
               break;
+            case 'tick':
+              // Ticks carry parallel ids/positions/velocities arrays.
+              this.tick = data.tick;
+              this.agents = data.ids.map((id, index) => ({
+                id,
+                position: data.positions[index],
+                velocity: data.velocities[index],
+              }));
+              break;
             case 'shutdown':
               this.status = 'idle';
               this.agents = [];
@@ -2,11 +2,6 @@ import numpy as np
 import enum
 from fish_agent import agent
 
-from mpl_toolkits import mplot3d
-import matplotlib.pyplot as plt
-import mpl_toolkits.mplot3d.axes3d as p3
-from matplotlib import animation
-
 class Mode(enum.Enum):
     SWARM = 'swarm'
     TORUS = 'torus'
@@ -63,11 +58,7 @@ class BaseSwarmModel:
     def update_agent_distance_table(self):
         """Update distance table between agents."""
         for i in range(self.num_agents):
-            for j in range(self.num_agents):
-                if self.agents[i].id == self.agents[j].id or \
-                   self.agent_distance_magnitude_table[i][j] != np.inf:
-                    continue
-                
+            for j in range(i + 1, self.num_agents):
                 r1 = np.array(self.agents[i].pos)
                 r2 = np.array(self.agents[j].pos)
                 
@@ -88,15 +79,17 @@ class BaseSwarmModel:
     def _common_update_logic(self):
         """Common update logic shared by all models"""
         self.update_agent_distance_table()
+        # Exposed for per-model passes that need pairwise distances (e.g. DPP density).
+        self._last_d = self.agent_distance_magnitude_table
+        # The diagonal is inf, so an agent never repels itself.
+        has_repulsion = (self.agent_distance_magnitude_table <= self.zor).any(axis=1)
         for i in range(self.num_agents):
-            my_distance = self.agent_distance_magnitude_table[i]
-            repulsion_mode = 0 if (my_distance[my_distance <= self.zor].size == 0) else 1
-            repulsion_vector = my_distance[my_distance <= self.zor]
+            repulsion_mode = has_repulsion[i]
             flag_o = 0 
             flag_a = 0
             for j in range(self.num_agents):
                 distance = self.agent_distance_magnitude_table[i][j]
-                if self.agents[i].id == self.agents[j].id:
+                if i == j:
                     continue
                 if repulsion_mode and distance > self.zor:
                     continue
@@ -122,10 +115,6 @@ class BaseSwarmModel:
             else:
                 v = np.array(self.agents[i].velocity_unit_vector)
                 self.agent_new_direction[i] = v 
-        
-        # Reset distance tables
-        self.agent_distance_vector_table = np.full((self.num_agents, self.num_agents, 3), np.inf)
-        self.agent_distance_magnitude_table = np.full((self.num_agents, self.num_agents), np.inf)
 
 class SwarmModel(BaseSwarmModel):
     def __init__(self, num_agents):
@@ -209,42 +198,28 @@ class DPPModel(BaseSwarmModel):
     
     def update_agent_position(self):
         """DPP-specific positioning with density-dependent perception"""
-        # First, calculate local density for each agent
-        local_density = np.zeros(self.num_agents)
-        for i in range(self.num_agents):
-            pos_i = np.array(self.agents[i].pos)
-            neighbor_count = 0
-            
-            for j in range(self.num_agents):
-                if i == j:
-                    continue
-                    
-                pos_j = np.array(self.agents[j].pos)
-                dist = euclidean_distance(pos_i, pos_j)
-                
-                if dist < self.perception_radius:
-                    neighbor_count += 1
-            
-            local_density[i] = neighbor_count / (4/3 * np.pi * self.perception_radius**3)
-        
         # Run common update logic
         self._common_update_logic()
-        
-        # Apply density-dependent modifications
-        for i in range(self.num_agents):
-            # Adjust direction based on local density
-            if local_density[i] > self.density_factor:
-                # In high-density regions, increase repulsion
-                self.agent_new_direction[i] *= (1 + local_density[i] * 0.1)
-            else:
-                # In low-density regions, increase attraction
-                pass  # Default behavior already handles this
-            
-            # Normalize the direction vector
-            if np.any(self.agent_new_direction[i]):
-                self.agent_new_direction[i] = unit_vector(self.agent_new_direction[i])
+
+        # Local density from the distance table; its diagonal is inf, so agents
+        # never count themselves.
+        r = self.perception_radius
+        local_density = (self._last_d < r).sum(axis=1) / (4/3 * np.pi * r**3)
+
+        # In high-density regions, increase repulsion; low-density regions keep
+        # the default behavior, which already handles attraction.
+        self.agent_new_direction *= np.where(
+            local_density > self.density_factor, 1 + local_density * 0.1, 1.0
+        )[:, None]
+
+        # Normalize the direction vectors
+        magnitude = np.linalg.norm(self.agent_new_direction, axis=1)
+        moving = magnitude != 0
+        self.agent_new_direction[moving] /= magnitude[moving, None]
 
 def update_plot_points(num,x,z, point, model, timestep=0.1):
+	import matplotlib.pyplot as plt
+
 	model.update_agent_position()
 	new_data = model.agent_new_direction
 	for i in range(model.num_agents):
@@ -261,22 +236,31 @@ def update_plot_points(num,x,z, point, model, timestep=0.1):
 
 	return point
 
-Writer = animation.writers['ffmpeg']
-writer = Writer(fps=6000, metadata=dict(artist='Me'), bitrate=180)
-num_agents = 10
-FLAG = 0
-fig = plt.figure(figsize=(8,8))
-ax = plt.axes(projection='3d')
-ax.set_xlim(-5,5)
-ax.set_ylim(-50,50)
-# ax.set_zlim(-50,50)
-zdata =  10 * np.random.random(num_agents)
-xdata = np.sin(zdata) + 5 * np.random.randn(num_agents)
-# ydata = np.cos(zdata) + 5 * np.random.randn(num_agents)
-# print((xdata,ydata,zdata))
-point = ax.scatter([], [], [], color='b')
-model = SwarmModel(num_agents)
-# model = Model(10 , Mode.swarm)
-ani=animation.FuncAnimation(fig, update_plot_points, frames=3, fargs=(xdata,zdata,point, model))
-plt.show(block=True)
-ani.save('temp.mp4',fps = 100)
+
+# The animation demo pulls in matplotlib and blocks on plt.show(), so it only
+# runs when this file is executed directly.
+if __name__ == "__main__":
+    from mpl_toolkits import mplot3d
+    import matplotlib.pyplot as plt
+    import mpl_toolkits.mplot3d.axes3d as p3
+    from matplotlib import animation
+
+    Writer = animation.writers['ffmpeg']
+    writer = Writer(fps=6000, metadata=dict(artist='Me'), bitrate=180)
+    num_agents = 10
+    FLAG = 0
+    fig = plt.figure(figsize=(8,8))
+    ax = plt.axes(projection='3d')
+    ax.set_xlim(-5,5)
+    ax.set_ylim(-50,50)
+    # ax.set_zlim(-50,50)
+    zdata =  10 * np.random.random(num_agents)
+    xdata = np.sin(zdata) + 5 * np.random.randn(num_agents)
+    # ydata = np.cos(zdata) + 5 * np.random.randn(num_agents)
+    # print((xdata,ydata,zdata))
+    point = ax.scatter([], [], [], color='b')
+    model = SwarmModel(num_agents)
+    # model = Model(10 , Mode.swarm)
+    ani=animation.FuncAnimation(fig, update_plot_points, frames=3, fargs=(xdata,zdata,point, model))
+    plt.show(block=True)
+    ani.save('temp.mp4',fps = 100)
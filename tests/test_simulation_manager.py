@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.services import simulation_manager
+from backend.services.simulation_manager import SimulationInstance, SimulationSettings
+
+
+def test_cancel_during_step_does_not_overlap_steps(monkeypatch):
+    # Enough workers that only the instance lock can keep steps apart.
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(simulation_manager, "STEP_EXECUTOR", executor)
+
+    async def scenario():
+        instance = SimulationInstance(SimulationSettings(num_agents=5, update_interval=0.0))
+        guard = threading.Lock()
+        started = threading.Event()
+        active = 0
+        peak = 0
+
+        def slow_step(timestep):
+            nonlocal active, peak
+            with guard:
+                active += 1
+                peak = max(peak, active)
+            started.set()
+            time.sleep(0.2)
+            with guard:
+                active -= 1
+            return {"ids": [], "positions": [], "velocities": []}
+
+        instance.model.step = slow_step
+        queue = await instance.register()
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+
+        # Cancel the runner mid-step, then restart it straight away.
+        instance.unregister(queue)
+        await asyncio.sleep(0)
+        queue = await instance.register()
+        tick = await asyncio.wait_for(queue.get(), timeout=5)
+        await instance.close()
+        return peak, tick
+
+    try:
+        peak, tick = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert peak == 1
+    assert tick["tick"] >= 1
+
+
+def test_failed_step_reports_error_and_allows_restart():
+    async def scenario():
+        instance = SimulationInstance(SimulationSettings(num_agents=5, update_interval=0.0))
+        working_step = instance.model.step
+
+        def failing_step(timestep):
+            raise ValueError("No threading layer could be loaded.")
+
+        instance.model.step = failing_step
+        queue = await instance.register()
+        error = await asyncio.wait_for(queue.get(), timeout=5)
+        instance.unregister(queue)
+        stopped = not instance._running
+
+        instance.model.step = working_step
+        queue = await instance.register()
+        tick = await asyncio.wait_for(queue.get(), timeout=5)
+        await instance.close()
+        return error, stopped, tick
+
+    error, stopped, tick = asyncio.run(scenario())
+    assert error["type"] == "error"
+    assert "threading layer" in error["message"]
+    assert stopped
+    assert tick["tick"] == 1
+
+
+def test_check_threading_layer_raises_without_openmp(monkeypatch):
+    def unavailable():
+        raise ValueError("No threading layer could be loaded.")
+
+    monkeypatch.setattr(simulation_manager.numba, "get_num_threads", unavailable)
+    with pytest.raises(RuntimeError, match="OpenMP"):
+        simulation_manager.check_threading_layer()
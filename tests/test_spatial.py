@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from backend.models.spatial import build_cell_list
+from backend.models.swarm import _make_step_kernel
+
+ZONES = (2.0, 3.0, 7.0)
+
+
+def all_pairs_directions(positions, velocities, zor, zoo, zoa):
+    """Zone-model headings from a brute-force scan over every pair."""
+    n = len(positions)
+    out = np.empty_like(velocities)
+    for i in range(n):
+        offsets = positions.astype(np.float64) - positions[i]
+        distances = np.linalg.norm(offsets, axis=1)
+        units = np.divide(offsets, distances[:, None], out=np.zeros_like(offsets), where=distances[:, None] > 0)
+        others = np.arange(n) != i
+        repulsion = others & (distances <= zor)
+        if repulsion.any():
+            direction = -units[repulsion].sum(axis=0)
+        else:
+            orientation = others & (distances > zor) & (distances <= zoo)
+            attraction = others & (distances > zoo) & (distances <= zoa)
+            direction = 0.5 * (velocities[orientation].sum(axis=0) + units[attraction].sum(axis=0))
+            if not (orientation.any() and attraction.any()):
+                direction *= 2
+        magnitude = np.linalg.norm(direction)
+        out[i] = direction / magnitude if magnitude != 0 else velocities[i]
+    return out
+
+
+def grid_directions(positions, velocities, zor, zoo, zoa, table_size=None):
+    out = np.zeros_like(velocities)
+    cells, cell_start, cell_end, sorted_idx = build_cell_list(positions, zoa, table_size)
+    _make_step_kernel(zor, zoo, zoa)(positions, velocities, cells, cell_start, cell_end, sorted_idx, out)
+    return out
+
+
+def random_swarm(rng, n, extent):
+    positions = rng.uniform(-extent, extent, (n, 3)).astype(np.float32)
+    velocities = rng.normal(size=(n, 3))
+    velocities /= np.linalg.norm(velocities, axis=1, keepdims=True)
+    return positions, velocities.astype(np.float32)
+
+
+@pytest.mark.parametrize("extent", [1.0, 15.0, 150.0])
+@pytest.mark.parametrize("table_size", [None, 1, 2, 3])
+def test_grid_matches_all_pairs(extent, table_size):
+    positions, velocities = random_swarm(np.random.default_rng(0), 200, extent)
+    expected = all_pairs_directions(positions, velocities, *ZONES)
+    actual = grid_directions(positions, velocities, *ZONES, table_size=table_size)
+    np.testing.assert_allclose(actual, expected, atol=1e-4)
+
+
+@pytest.mark.parametrize("table_size", [None, 1])
+def test_grid_handles_colocated_and_boundary_pairs(table_size):
+    zor, zoo, zoa = ZONES
+    positions = np.array(
+        [
+            [0.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0],
+            [zoa, 0.0, 0.0],
+            [0.0, zoo, 0.0],
+            [0.0, 0.0, -zor],
+            [40.0, 0.0, 0.0],
+            [40.0 + zoa, 0.0, 0.0],
+        ],
+        dtype=np.float32,
+    )
+    _, velocities = random_swarm(np.random.default_rng(1), len(positions), 1.0)
+    expected = all_pairs_directions(positions, velocities, *ZONES)
+    actual = grid_directions(positions, velocities, *ZONES, table_size=table_size)
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+
+def test_single_agent_keeps_its_heading():
+    positions, velocities = random_swarm(np.random.default_rng(2), 1, 1.0)
+    np.testing.assert_array_equal(grid_directions(positions, velocities, *ZONES), velocities)